@@ -21,6 +21,8 @@
 import sys
 import os
 import uuid
+from collections import deque
+from contextlib import contextmanager
 from PySide2 import QtWidgets, QtGui, QtCore, QtSvg
 
 import pymxs
@@ -32,16 +34,180 @@ try:
 except ImportError:
     HAS_QTMAX = False
 
+# Stylesheets are constants: built once at import, shared by every dock instance
+MAIN_QSS = """
+QWidget {
+    background-color: #444444; /* Fondo base oscuro */
+    color: #ffffff;
+    font-family: 'Segoe UI', Arial, sans-serif;
+    font-size: 13px;
+}
+QDialog, QDockWidget {
+    background-color: #444444;
+    border: 1px solid #333;
+}
+QLabel {
+    color: #ffffff;
+}
+QLineEdit {
+    border: 1px solid #444;
+    background-color: #646464;
+    border-radius: 3px;
+    padding: 4px 8px;
+    color: #ffffff;
+}
+QPushButton {
+    background-color: #646464;
+    border: 1px solid #555;
+    border-radius: 3px;
+    padding: 5px;
+    color: #ffffff;
+}
+QPushButton:hover {
+    background-color: #707070;
+    border-color: #888;
+}
+QPushButton:pressed {
+    background-color: #496a93;
+}
+QListWidget {
+    border: 1px solid #383838;
+    background-color: #4f4f4f;
+    border-radius: 3px;
+    outline: none;
+    color: #ffffff;
+}
+QListWidget::item {
+    padding: 8px 10px;
+    color: #ffffff;
+    border-bottom: 1px solid #3d3d3d;
+}
+QListWidget::item:alternate {
+    background-color: #5a5a5a;
+}
+QListWidget::item:selected {
+    background-color: #1e9bfd; /* Azul estándar selección */
+    color: #ffffff;
+    border: none;
+}
+QListWidget::item:hover:!selected {
+    background-color: #606060;
+}
+QCheckBox {
+    color: #ffffff;
+    spacing: 5px;
+}
+QCheckBox::indicator {
+    width: 14px;
+    height: 14px;
+    background-color: #646464; /* Unchecked background */
+    border: 1px solid #444;    /* Border requested */
+    border-radius: 8px;
+}
+QCheckBox::indicator:hover {
+    border-color: #888;
+    background-color: #707070;
+}
+QCheckBox::indicator:checked {
+    width: 6px;
+    height: 6px;
+    background-color: #474747; /* Blue when checked */
+    border: 5px solid #d4d4d4;
+}
+"""
+
+ACTION_BTN_QSS = """
+QPushButton {
+    background-color: #646464;
+    border: 1px solid #555;
+    color: #ffffff;
+}
+QPushButton:hover {
+     background-color: #383838;
+     border: 1px solid #383838;
+}
+QPushButton:pressed {
+    background-color: #496a93;
+    border: 1px solid #496a93;
+}
+"""
+
+# Message box buttons: highlighted (recommended) action and the plain ones
+DIALOG_PRIMARY_BTN_QSS = """
+background-color: #1e9bfd;
+color: white;
+border: 1px solid #1e9bfd;
+border-radius: 3px;
+padding: 5px 15px;
+"""
+
+# "Save" in the unsaved-changes prompt: primary style, larger and bold
+DIALOG_SAVE_BTN_QSS = """
+background-color: #1e9bfd;
+color: white;
+border: 1px solid #1e9bfd;
+border-radius: 3px;
+padding: 5px 25px; /* Larger padding */
+font-weight: bold;
+"""
+
+DIALOG_BTN_QSS = "padding: 5px 15px;"
+
+# Save button while cyan-marked scenes exist ("Save marked")
+SAVE_MARKED_BTN_QSS = """
+QPushButton {
+    background-color: #646464;
+    border: 1px solid #4fdc45;
+    color: #ffffff;
+}
+QPushButton:hover {
+     background-color: #4fdc45;
+     border: 1px solid #4fdc45; /* Cyan Border */
+}
+QPushButton:pressed {
+    background-color: #559191;
+    border: 1px solid #4fdc45;
+}
+"""
+
+# check_dirty_status skips getSaveRequired() while no node event arrived, but
+# still samples every N ticks for changes that raise none (render setup, env...)
+DIRTY_RESAMPLE_TICKS = 5
+
+
+# MaxScript Name values (#mergeDups, #select...) built once instead of one
+# rt.name() bridge call per use
+_MXS_NAME_CACHE = {}
+
+def mxs_name(name):
+    """Cached rt.name(name)."""
+    value = _MXS_NAME_CACHE.get(name)
+    if value is None:
+        value = _MXS_NAME_CACHE[name] = rt.name(name)
+    return value
+
+
+# Icons don't change during a session: resolve each one once and share it
+# between imports and dock instances
+_ICON_CACHE = {}
+_SVG_ICON_CACHE = {}
+_SCENE_ICON_CACHE = {} # "ATSScene" -> ATSScene.ico icon, or a null QIcon if missing
+
 def get_icon(max_name, fallback_standard_icon_attr=None, style=None):
     """
     Intenta cargar un icono nativo de Max (debug enabled).
     Si falla y no hay fallback, devuelve QIcon nulo.
+    Los iconos de Max encontrados se guardan en _ICON_CACHE.
     """
-    icon = None
+    icon = _ICON_CACHE.get(max_name)
+    if icon is not None:
+        return icon
+
     if HAS_QTMAX:
         try:
              icon = qtmax.GetQIcon(max_name)
              if icon and not icon.isNull():
+                 _ICON_CACHE[max_name] = icon
                  return icon
         except:
              pass
@@ -50,6 +216,7 @@ def get_icon(max_name, fallback_standard_icon_attr=None, style=None):
         try:
             icon = qtmax.LoadMaxMultiResIcon(path_name)
             if icon and not icon.isNull():
+                 _ICON_CACHE[max_name] = icon
                  return icon
         except:
             pass
@@ -60,6 +227,30 @@ def get_icon(max_name, fallback_standard_icon_attr=None, style=None):
 
     return QtGui.QIcon()
 
+def get_scene_icon(style=None):
+    """
+    Icono de las escenas de la lista: ATSScene.ico de la instalación de Max
+    o, si no existe, el icono de 3ds Max. El .ico se busca una sola vez y todos
+    los items comparten la misma instancia de QIcon; el icono de 3ds Max lo
+    cachea get_icon (el fallback del estilo no se cachea, depende de style).
+    """
+    icon = _SCENE_ICON_CACHE.get("ATSScene")
+    if icon is None:
+        icon = QtGui.QIcon()
+        try:
+            max_root = rt.getDir(mxs_name("maxroot"))
+            custom_icon_path = os.path.join(max_root, "UI_ln", "IconsDark", "ATS", "ATSScene.ico")
+            if os.path.exists(custom_icon_path):
+                icon = QtGui.QIcon(custom_icon_path)
+        except:
+            pass
+        _SCENE_ICON_CACHE["ATSScene"] = icon
+
+    if not icon.isNull():
+        return icon
+
+    return get_icon("Citras/3dsMax", QtWidgets.QStyle.SP_FileIcon, style)
+
 def create_svg_icon(svg_string, width=24, height=24, color_hex="#ffffff"):
     """
     Creates a QIcon from an SVG string.
@@ -67,6 +258,11 @@ def create_svg_icon(svg_string, width=24, height=24, color_hex="#ffffff"):
     """
     if not svg_string:
         return QtGui.QIcon()
+
+    cache_key = (svg_string, width, height, color_hex)
+    cached = _SVG_ICON_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
         
     # Simple tinting: replace a placeholder or standard black with desired color
     # This is a basic example; for complex SVGs use a proper XML parser or Qt's coloring
@@ -81,55 +277,112 @@ def create_svg_icon(svg_string, width=24, height=24, color_hex="#ffffff"):
     renderer.render(painter)
     painter.end()
     
-    return QtGui.QIcon(pixmap)
+    icon = QtGui.QIcon(pixmap)
+    _SVG_ICON_CACHE[cache_key] = icon
+    return icon
+
+def create_dot_pixmap(fill_hex, size, border_hex=None, border_width=0, dpr=1.0):
+    """
+    Renders an antialiased circle (optionally with a border) into a
+    transparent QPixmap of size x size logical pixels.
+    Used to blit marker dots instead of rasterizing ellipses on every paint.
+    """
+    pixmap = QtGui.QPixmap(int(size * dpr), int(size * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(QtCore.Qt.transparent)
+
+    painter = QtGui.QPainter(pixmap)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.setPen(QtCore.Qt.NoPen)
+    if border_hex and border_width:
+        painter.setBrush(QtGui.QColor(border_hex))
+        painter.drawEllipse(QtCore.QRectF(0, 0, size, size))
+    painter.setBrush(QtGui.QColor(fill_hex))
+    inner = size - (border_width * 2)
+    painter.drawEllipse(QtCore.QRectF(border_width, border_width, inner, inner))
+    painter.end()
+
+    return pixmap
+
+
+class FileStatSignals(QtCore.QObject):
+    """Carries a FileStatTask result back to the UI thread (path, st_mtime_ns or None)."""
+    finished = QtCore.Signal(str, object)
+
+
+class FileStatTask(QtCore.QRunnable):
+    """
+    Stats a file on a QThreadPool worker. Pure filesystem work, no pymxs calls:
+    Max's API is only safe on the main thread.
+    Each task owns its (unparented) signals object, so a stat finishing after
+    the dock was closed never emits on a deleted QObject.
+    """
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.signals = FileStatSignals()
+
+    def run(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        self.signals.finished.emit(self.path, mtime)
 
 class SceneDelegate(QtWidgets.QStyledItemDelegate):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, switcher=None):
         super().__init__(parent)
+        # Owner of the per-row marker arrays (orange_marks / cyan_marks / external_marks)
+        self.switcher = switcher
         self.strip_width = 20
         self.right_margin = 10 
         self.dot_spacing = 10
+        self.radius = 5
+
+        # Dots are pre-rendered once and blitted in paint(); x-offsets are
+        # relative to rect.right() and constant too
+        dpr = QtWidgets.QApplication.instance().devicePixelRatio()
+        dot_size = self.radius * 2
+        self.dot_orange = create_dot_pixmap("#ff736a", dot_size, dpr=dpr)
+        self.dot_cyan = create_dot_pixmap("#4fdc45", dot_size, dpr=dpr)
+        self.dot_white = create_dot_pixmap("#ffffff", dot_size, dpr=dpr)
+
+        half_strip = self.strip_width / 2
+        step = self.strip_width + self.dot_spacing
+        self.dx_orange = -(self.right_margin + half_strip)
+        self.dx_cyan = self.dx_orange - step
+        self.dx_white = self.dx_cyan - step
 
     def paint(self, painter, option, index):
         # 1. Draw default
         super().paint(painter, option, index)
-        
+
+        row = index.row()
+        is_marked_orange = self.switcher.orange_marks[row]
+        is_marked_cyan = self.switcher.cyan_marks[row]
+        # External change detected. Non-interactive, just an indicator
+        has_external_change = self.switcher.external_marks[row]
+
+        # Most rows carry no dots
+        if not (is_marked_orange or is_marked_cyan or has_external_change):
+            return
+
         rect = option.rect
-        center_y = rect.center().y()
-        radius = 5
-        
-        painter.save()
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        painter.setPen(QtCore.Qt.NoPen)
-        
-        # Base right edge for calculations
-        base_right = rect.right() - self.right_margin
+        # Top-left of a dot = its center - radius
+        left = rect.right() - self.radius
+        top = rect.center().y() - self.radius
 
-        # 2. Check if marked ORANGE (UserRole + 2) - Rightmost
-        is_marked_orange = index.data(QtCore.Qt.UserRole + 2)
+        # 2. ORANGE - Rightmost
         if is_marked_orange:
-            center_x_orange = base_right - (self.strip_width / 2)
-            painter.setBrush(QtGui.QBrush(QtGui.QColor("#ff736a")))
-            painter.drawEllipse(QtCore.QPointF(center_x_orange, center_y), radius, radius)
+            painter.drawPixmap(QtCore.QPointF(left + self.dx_orange, top), self.dot_orange)
 
-        # 3. Check if marked CYAN (UserRole + 3) - Left of Orange (with spacing)
-        is_marked_cyan = index.data(QtCore.Qt.UserRole + 3)
+        # 3. CYAN - Left of Orange (with spacing)
         if is_marked_cyan:
-            # 2nd strip from right + spacing
-            center_x_cyan = base_right - self.strip_width - self.dot_spacing - (self.strip_width / 2)
-            painter.setBrush(QtGui.QBrush(QtGui.QColor("#4fdc45")))
-            painter.drawEllipse(QtCore.QPointF(center_x_cyan, center_y), radius, radius)
-
-        # 4. Check if EXTERNAL CHANGE DETECTED (UserRole + 4) - Left of Cyan (with spacing)
-        # This is non-interactive, just an indicator
-        has_external_change = index.data(QtCore.Qt.UserRole + 4)
-        if has_external_change:
-             # 3rd strip position: Right - Strip - Gap - Strip - Gap - (Strip/2)
-             center_x_white = base_right - (self.strip_width * 2) - (self.dot_spacing * 2) - (self.strip_width / 2)
-             painter.setBrush(QtGui.QBrush(QtGui.QColor("#ffffff")))
-             painter.drawEllipse(QtCore.QPointF(center_x_white, center_y), radius, radius)
+            painter.drawPixmap(QtCore.QPointF(left + self.dx_cyan, top), self.dot_cyan)
 
-        painter.restore()
+        # 4. WHITE (external change) - Left of Cyan (with spacing)
+        if has_external_change:
+            painter.drawPixmap(QtCore.QPointF(left + self.dx_white, top), self.dot_white)
 
     def editorEvent(self, event, model, option, index):
         # Handle interaction (Click on strips)
@@ -142,8 +395,8 @@ class SceneDelegate(QtWidgets.QStyledItemDelegate):
             # Orange Strip (Rightmost strip area)
             # Range: [base_right - strip_width, base_right]
             if click_x > (base_right - self.strip_width) and click_x <= base_right:
-                current_state = index.data(QtCore.Qt.UserRole + 2)
-                model.setData(index, not current_state, QtCore.Qt.UserRole + 2)
+                self.switcher.toggle_marker(index.row(), orange=True)
+                model.dataChanged.emit(index, index, [QtCore.Qt.UserRole + 2])
                 return True 
             
             # Cyan Strip (Left of Orange + Spacing)
@@ -152,13 +405,47 @@ class SceneDelegate(QtWidgets.QStyledItemDelegate):
             cyan_left_edge = cyan_right_edge - self.strip_width
             
             if click_x > cyan_left_edge and click_x <= cyan_right_edge:
-                current_state = index.data(QtCore.Qt.UserRole + 3)
-                model.setData(index, not current_state, QtCore.Qt.UserRole + 3)
+                self.switcher.toggle_marker(index.row(), orange=False)
+                model.dataChanged.emit(index, index, [QtCore.Qt.UserRole + 3])
                 return True
                 
         return super().editorEvent(event, model, option, index)
 
 
+class MarkerCheckBox(QtWidgets.QCheckBox):
+    """
+    Master marker checkbox. Replicates the 'dot' indicator from MAIN_QSS with
+    the marker color, but blits pixmaps rendered once in __init__ instead of
+    running the stylesheet engine on every toggle.
+    """
+    def __init__(self, color_hex, parent=None):
+        super().__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_Hover)
+
+        # Same geometry as the QSS indicator: 16px circle (content + border)
+        dpr = self.devicePixelRatioF()
+        self.pix_unchecked = create_dot_pixmap("#646464", 16, "#444444", 1, dpr)
+        self.pix_hover = create_dot_pixmap("#707070", 16, "#888888", 1, dpr)
+        self.pix_checked = create_dot_pixmap("#474747", 16, color_hex, 5, dpr)
+
+    def hitButton(self, pos):
+        # No text: the whole widget is the indicator
+        return self.rect().contains(pos)
+
+    def paintEvent(self, event):
+        if self.isChecked():
+            pixmap = self.pix_checked
+        elif self.underMouse():
+            pixmap = self.pix_hover
+        else:
+            pixmap = self.pix_unchecked
+
+        painter = QtGui.QPainter(self)
+        y = (self.height() - 16) // 2
+        painter.drawPixmap(0, y, pixmap)
+        painter.end()
+
+
 class SceneSwitcherUI(QtWidgets.QDockWidget):
     def __init__(self, parent=None):
         if parent is None:
@@ -176,21 +463,54 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         self.main_widget = QtWidgets.QWidget()
         self.setWidget(self.main_widget)
 
+        # Set by Max node events; check_dirty_status only asks Max for the
+        # save flag when something may have changed since the last tick
+        self.max_dirty_hint = True
+        self.dirty_idle_ticks = 0 # Ticks skipped since the last real sample
+        self.node_event_cb = None
+
+        # Temporary material suffix of each merge: one random base per dock
+        # instance (so suffixes left in the scene by an earlier dock don't
+        # collide) plus a cheap counter per import
+        self.suffix_base = uuid.uuid4().hex[:8]
+        self.suffix_counter = 0
+
+        # >0 while a batch runs: viewport redraws are deferred to its end
+        self.redraw_suppressed = 0
+
+        # Scratch file used by force_clean_and_restart_timer (resolved on first use)
+        self.reset_temp_file = None
+
         self.init_ui()
         self.apply_styles()
 
+        try:
+            self.node_event_cb = rt.NodeEventCallback(all=self._on_max_node_event)
+        except Exception as e:
+            print(f"Could not register NodeEventCallback: {e}")
+
         try:
             # Initialize global variables
             rt.execute('global QSS_IsActive = true')
             rt.execute('global QSS_ActiveScenePath = ""')
             rt.execute('global QSS_ActiveLayerName = ""')
             rt.execute('global QSS_OrangeMarkedScenes = #()')
+            # #(animHandle, originalName) per material renamed during a merge
+            rt.execute('global QSS_MatOriginalNames = #()')
         except:
             pass
 
     def closeEvent(self, event):
         if hasattr(self, 'dirty_timer'):
             self.dirty_timer.stop()
+
+        # NodeEventCallbacks are released by dropping the reference + gc
+        if self.node_event_cb is not None:
+            self.node_event_cb = None
+            try:
+                rt.gc(light=True)
+            except:
+                pass
         
         try:
             rt.execute('global QSS_IsActive = false')
@@ -207,7 +527,9 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         self.disable_detection_cb = QtWidgets.QCheckBox("Disable changes detection (faster)")
         self.disable_detection_cb.setChecked(True) # Enabled by default as requested
         self.disable_detection_cb.setVisible(False) # Hidden from UI
-        self.disable_detection_cb.stateChanged.connect(self.check_dirty_status)
+        # Mirrored in a plain attribute: read on every dirty tick, save and switch
+        self.detection_disabled = self.disable_detection_cb.isChecked()
+        self.disable_detection_cb.stateChanged.connect(self.on_detection_toggled)
         main_layout.addWidget(self.disable_detection_cb)
 
         folder_layout = QtWidgets.QHBoxLayout()
@@ -250,39 +572,16 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         self.folder_name_label.setStyleSheet("color: #ffffff; font-weight: bold; font-size: 15px; margin-top: 3px; margin-bottom: 3px;")
         
         
-        self.master_cyan_checkbox = QtWidgets.QCheckBox()
+        self.master_cyan_checkbox = MarkerCheckBox("#4fdc45")
         self.master_cyan_checkbox.setFixedWidth(20) 
         self.master_cyan_checkbox.setToolTip("Mark/Unmark All Cyan")
         self.master_cyan_checkbox.clicked.connect(self.toggle_all_cyan_markers)
-        
-        # Cyan Checkbox Style
-        # Replicating the 'dot' style from main CSS but with Cyan colors
-        self.master_cyan_checkbox.setStyleSheet("""
-            QCheckBox::indicator:checked {
-                width: 6px;
-                height: 6px;
-                border-radius: 8px;
-                background-color: #474747;
-                border: 5px solid #4fdc45;
-            }
-        """)
 
-        self.master_orange_checkbox = QtWidgets.QCheckBox()
+        self.master_orange_checkbox = MarkerCheckBox("#ff736a")
         self.master_orange_checkbox.setFixedWidth(20) 
         self.master_orange_checkbox.setToolTip("Mark/Unmark All Orange")
         self.master_orange_checkbox.clicked.connect(self.toggle_all_orange_markers)
         
-        # Orange Checkbox Style
-        self.master_orange_checkbox.setStyleSheet("""
-            QCheckBox::indicator:checked {
-                width: 6px;
-                height: 6px;
-                border-radius: 8px;
-                background-color: #474747;
-                border: 5px solid #ff736a;
-            }
-        """)
-        
         # Spacer
         header_layout.addWidget(self.folder_name_label)
         header_layout.addStretch()
@@ -298,13 +597,37 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         self.scene_list = QtWidgets.QListWidget()
         self.scene_list.setAlternatingRowColors(True)
         self.scene_list.itemDoubleClicked.connect(self.switch_to_scene_layer)
-        # Connect dataChanged to check for cyan markers AND update Orange global
-        self.scene_list.model().dataChanged.connect(self.check_cyan_markers_state)
-        self.scene_list.model().dataChanged.connect(self.update_orange_global_variable)
-        self.scene_list.model().dataChanged.connect(self.update_master_checkboxes_state)
+        # dataChanged (markers, text, fonts...) only schedules the marker-dependent
+        # updates; bursts of changes are coalesced into one flush
+        self.marker_update_timer = QtCore.QTimer(self)
+        self.marker_update_timer.setSingleShot(True)
+        self.marker_update_timer.setInterval(50)
+        self.marker_update_timer.timeout.connect(self.flush_marker_updates)
+        self.scene_list.model().dataChanged.connect(self.schedule_marker_updates)
         
+        # Python-side refs to the list items (row order), so hot loops don't
+        # go through scene_list.item(i) for every row
+        self.scene_items = []
+
+        # Marker state per row, read directly by the delegate.
+        # Kept outside the item data so toggling all rows is a single slice
+        # assignment + one dataChanged instead of N setData calls.
+        self.orange_marks = []
+        self.cyan_marks = []
+        self.external_marks = [] # White: file changed on disk since import/save
+        # Running count of True entries, so master/save state checks are O(1)
+        self.n_orange = 0
+        self.n_cyan = 0
+
+        # '#("Layer", "Path")' entry per row for QSS_OrangeMarkedScenes, and the
+        # last array string sent to MaxScript
+        self.orange_mxs_entries = []
+        self.orange_global_value = "#()"
+        # '@"Layer"' literal per row, joined into the array used by scene switches
+        self.layer_name_entries = []
+
         # Set Custom Delegate
-        self.delegate = SceneDelegate(self.scene_list)
+        self.delegate = SceneDelegate(self.scene_list, self)
         self.scene_list.setItemDelegate(self.delegate)
         
         main_layout.addWidget(self.scene_list)
@@ -361,6 +684,7 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         self.save_btn.setFixedHeight(35)
         self.save_btn.setToolTip("Save the current scene (layer) back to its file")
         self.save_btn.clicked.connect(self.action_save_wrapper) # Changed to wrapper
+        self.save_btn_marked = False # Whether the button is in "Save marked" mode
 
         self.copy_btn = QtWidgets.QPushButton(" Copy")
         self.copy_btn.setIcon(icon_copy)
@@ -383,49 +707,75 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         self.active_scene_item = None
 
         self.dirty_timer = QtCore.QTimer(self)
-        self.dirty_timer = QtCore.QTimer(self)
-        self.dirty_timer.timeout.connect(self.check_modifications)
-        self.dirty_timer.start(500)
+        # External file changes are pushed by fs_watcher, so this slow tick
+        # only has to poll Max's own dirty flag
+        self.dirty_timer.setInterval(2000)
+        self.dirty_timer.timeout.connect(self.check_dirty_status)
+        self.dirty_timer.start()
 
         self.is_ui_dirty = False
+        self.dirty_items = set() # Items currently showing the "*" suffix
+
+        # Fonts for update_list_highlights, built once
+        self.font_normal = QtGui.QFont()
+        self.font_bold = QtGui.QFont()
+        self.font_bold.setBold(True)
 
-        self.file_timestamps = {}
-        self.background_check_counter = 0 # Counter for slower background checks
+        self.file_timestamps = {} # full_path -> st_mtime_ns (integer, exact compares)
+        self.row_by_path = {} # full_path -> list row, for watcher notifications
 
-        if not self.dirty_timer.isActive():
-            self.dirty_timer.start(500)
+        self.fs_watcher = QtCore.QFileSystemWatcher(self)
+        self.fs_watcher.fileChanged.connect(self._on_file_changed)
+        # Active-scene notifications received while dirty_timer was stopped
+        # (switch, merge, save, batch), handled on its next tick
+        self.deferred_change_paths = set()
+
+        # Post-save stats run off the UI thread; change notifications for these
+        # paths are our own save and are ignored until the new mtime lands
+        self.pending_stats = set()
 
     def toggle_all_orange_markers(self):
         """Toggles the marked state for all items based on master checkbox (ORANGE)."""
         state = self.master_orange_checkbox.isChecked()
-        
-        # Block signals to prevent massive dataChanged spam
-        self.scene_list.model().blockSignals(True)
-        try:
-            for i in range(self.scene_list.count()):
-                item = self.scene_list.item(i)
-                item.setData(QtCore.Qt.UserRole + 2, state)
-        finally:
-            self.scene_list.model().blockSignals(False)
-        
-        self.scene_list.viewport().update()
-        self.update_orange_global_variable() # Update global immediately
+        self.orange_marks[:] = [state] * len(self.orange_marks)
+        self.n_orange = len(self.orange_marks) if state else 0
+        self.emit_markers_changed(QtCore.Qt.UserRole + 2)
 
     def toggle_all_cyan_markers(self):
         """Toggles the marked state for all items based on master checkbox (CYAN)."""
         state = self.master_cyan_checkbox.isChecked()
-        
-        # Block signals to prevent massive dataChanged spam
-        self.scene_list.model().blockSignals(True)
-        try:
-            for i in range(self.scene_list.count()):
-                item = self.scene_list.item(i)
-                item.setData(QtCore.Qt.UserRole + 3, state)
-        finally:
-            self.scene_list.model().blockSignals(False)
-        
-        self.scene_list.viewport().update()
-        self.check_cyan_markers_state() # Update UI immediately
+        self.cyan_marks[:] = [state] * len(self.cyan_marks)
+        self.n_cyan = len(self.cyan_marks) if state else 0
+        self.emit_markers_changed(QtCore.Qt.UserRole + 3)
+
+    def toggle_marker(self, row, orange):
+        """Flips the orange or cyan marker of one row and updates its counter."""
+        if orange:
+            state = self.orange_marks[row] = not self.orange_marks[row]
+            self.n_orange += 1 if state else -1
+        else:
+            state = self.cyan_marks[row] = not self.cyan_marks[row]
+            self.n_cyan += 1 if state else -1
+
+    def emit_markers_changed(self, role):
+        """Single dataChanged for the whole list (one repaint, one round of slots)."""
+        count = len(self.scene_items)
+        if count == 0:
+            return
+
+        model = self.scene_list.model()
+        model.dataChanged.emit(model.index(0, 0), model.index(count - 1, 0), [role])
+
+    def schedule_marker_updates(self, *args):
+        """Queues flush_marker_updates; repeated calls within 50 ms run it once."""
+        if not self.marker_update_timer.isActive():
+            self.marker_update_timer.start()
+
+    def flush_marker_updates(self):
+        """Save button (cyan), Orange global and master checkboxes, in one pass."""
+        self.check_cyan_markers_state()
+        self.update_orange_global_variable()
+        self.update_master_checkboxes_state()
 
     def update_orange_global_variable(self):
         """
@@ -433,72 +783,101 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         with the currently marked Orange scenes (LayerName, Path).
         Format: #(#("Layer", "Path"), ...)
         """
+        # Entries are pre-escaped per row in import_single_scene
+        marked_data = [entry for entry, marked in zip(self.orange_mxs_entries, self.orange_marks) if marked]
+        mxs_array_str = "#(" + ", ".join(marked_data) + ")"
 
+        # dataChanged fires for any item change (text, font, flags):
+        # don't cross into MaxScript when the marked set is the same
+        if mxs_array_str == self.orange_global_value:
+            return
 
-        marked_data = []
-        for i in range(self.scene_list.count()):
-            item = self.scene_list.item(i)
-            # Check Orange Marker (UserRole + 2)
-            if item.data(QtCore.Qt.UserRole + 2):
-                layer_name = item.data(QtCore.Qt.UserRole + 1)
-                full_path = item.data(QtCore.Qt.UserRole)
-                
-                # Escape backslashes for MaxScript string
-                safe_path = full_path.replace("\\", "\\\\")
-                marked_data.append(f'#("{layer_name}", "{safe_path}")')
-        
-        # Construct MaxScript array string
-        if marked_data:
-            mxs_array_str = "#(" + ", ".join(marked_data) + ")"
-        else:
-            mxs_array_str = "#()"
-            
         try:
             rt.execute(f'global QSS_OrangeMarkedScenes = {mxs_array_str}')
+            self.orange_global_value = mxs_array_str
         except Exception as e:
             print(f"Error updating global QSS_OrangeMarkedScenes: {e}")
 
-    def check_modifications(self):
-        """Wrapper to check both internal dirty state and external file changes."""
-        self.check_dirty_status()
-        self.check_external_changes()
-        
-        # Background check for inactive scenes (approx every 5s if timer is 500ms)
-        self.background_check_counter += 1
-        if self.background_check_counter >= 10:
-            self.check_background_files()
-            self.background_check_counter = 0
+    def watch_file(self, full_path):
+        """(Re)registers a scene file in the watcher if it isn't watched yet."""
+        if full_path in self.fs_watcher.files():
+            return
+
+        if os.path.exists(full_path):
+            self.fs_watcher.addPath(full_path)
+        elif full_path in self.file_timestamps:
+            # Notified between the delete and rename of an atomic replace:
+            # try once more when the new file should be in place
+            QtCore.QTimer.singleShot(500, lambda: self._retry_watch_file(full_path))
+
+    def _retry_watch_file(self, full_path):
+        """Second and last attempt of watch_file for a scene missing on disk."""
+        if full_path in self.fs_watcher.files() or not os.path.exists(full_path):
+            return
+
+        self.fs_watcher.addPath(full_path)
+        # The change that dropped it was notified while the file was missing
+        self._on_file_changed(full_path)
 
-    def check_background_files(self):
+    def _on_file_changed(self, path):
         """
-        Checks all inactive scenes for external modifications.
-        Sets UserRole + 4 to True/False based on modification state.
+        Called by fs_watcher when a scene file changes on disk.
+        Active scene -> reload prompt. Inactive scenes -> white marker.
         """
-        for i in range(self.scene_list.count()):
-            item = self.scene_list.item(i)
-            
-            # Skip active scene (handled by check_external_changes)
-            if item == self.active_scene_item:
-                continue
-                
-            full_path = item.data(QtCore.Qt.UserRole)
-            if not full_path or full_path not in self.file_timestamps:
-                continue
-                
-            try:
-                current_mtime = os.path.getmtime(full_path)
-                last_mtime = self.file_timestamps[full_path]
-                
-                has_changed = current_mtime > last_mtime
-                
-                # Only update/redraw if state changed to avoid flickering
-                current_flag = item.data(QtCore.Qt.UserRole + 4)
-                if current_flag != has_changed:
-                    item.setData(QtCore.Qt.UserRole + 4, has_changed)
-                    
-            except Exception:
-                pass
-                
+        # Files saved by replacing them are dropped from the watcher
+        self.watch_file(path)
+
+        if path not in self.file_timestamps or path in self.pending_stats:
+            return
+
+        if self.active_scene_item and self.active_scene_item.data(QtCore.Qt.UserRole) == path:
+            # The signal is also delivered inside other operations' modal loops
+            # (unsaved-changes box, batch confirmation, merge progress): only
+            # prompt when no operation holds the timer, as the polling used to
+            if not self.dirty_timer.isActive():
+                self.deferred_change_paths.add(path)
+                return
+            self.check_external_changes()
+            return
+
+        try:
+            has_changed = os.stat(path).st_mtime_ns > self.file_timestamps[path]
+        except Exception:
+            return
+
+        row = self.row_by_path.get(path)
+        if row is None:
+            return
+
+        self.set_external_mark(row, has_changed)
+
+    def _on_saved_file_stat(self, path, mtime):
+        """
+        FileStatTask result for a file this tool just saved: stamps its mtime and
+        clears Max's dirty state. An unchanged mtime is not a failure (FAT and
+        some network volumes have 2 s resolution); only a missing file is.
+        """
+        self.pending_stats.discard(path)
+        self.watch_file(path)
+
+        if mtime is None:
+            QtWidgets.QMessageBox.warning(self, "Save Error", f"'{os.path.basename(path)}' was not found after saving.")
+            self.dirty_timer.start()
+            return
+
+        self.file_timestamps[path] = mtime
+        QtCore.QTimer.singleShot(200, lambda: self.force_clean_and_restart_timer(use_temp_save=True))
+
+    def set_external_mark(self, row, state):
+        """Sets the white marker of a row. Only repaints if the state changed (no flickering)."""
+        if self.external_marks[row] == state:
+            return
+
+        self.external_marks[row] = state
+        model = self.scene_list.model()
+        model_index = model.index(row, 0)
+        model.dataChanged.emit(model_index, model_index, [QtCore.Qt.UserRole + 4])
+
     def check_external_changes(self):
         """
         Revisa si el archivo de la escena activa ha sido modificado externamente.
@@ -512,7 +891,7 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
             return
 
         try:
-            current_mtime = os.path.getmtime(full_path)
+            current_mtime = os.stat(full_path).st_mtime_ns
             last_mtime = self.file_timestamps[full_path]
 
             if current_mtime > last_mtime:
@@ -526,33 +905,28 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
                 btn_reload = msg_box.addButton("Reload", QtWidgets.QMessageBox.AcceptRole)
                 btn_ignore = msg_box.addButton("Ignore", QtWidgets.QMessageBox.RejectRole)
 
-                btn_reload.setStyleSheet("""
-                    background-color: #1e9bfd;
-                    color: white;
-                    border: 1px solid #1e9bfd;
-                    border-radius: 3px;
-                    padding: 5px 15px;
-                """)
-                btn_ignore.setStyleSheet("padding: 5px 15px;")
+                btn_reload.setStyleSheet(DIALOG_PRIMARY_BTN_QSS)
+                btn_ignore.setStyleSheet(DIALOG_BTN_QSS)
 
+                # dirty_timer is stopped: further changes of this file are deferred
+                # (no stacked prompt), other scenes still get their white marker
                 msg_box.exec_()
 
                 if msg_box.clickedButton() == btn_reload:
                     self.reload_active_scene()
                 else:
                     self.file_timestamps[full_path] = current_mtime
-                    self.dirty_timer.start(500)
+                    self.dirty_timer.start()
 
         except Exception as e:
-            if not self.dirty_timer.isActive():
-                self.dirty_timer.start(500)
+            self.dirty_timer.start()
 
     def reload_active_scene(self):
         """Wrapper for reloading the active scene."""
         if self.active_scene_item:
             self.reload_scene(self.active_scene_item)
         else:
-             self.dirty_timer.start(500)
+             self.dirty_timer.start()
 
     def reload_scene(self, item):
         """
@@ -566,197 +940,90 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         index = self.scene_list.row(item)
 
         rt.disableRefMsgs()
+        rt.disableSceneRedraw()
 
         try:
             root_layer = rt.LayerManager.getLayerFromName(display_name)
 
             if root_layer:
-                all_layers_cache = []
-                for i in range(rt.LayerManager.count):
-                    all_layers_cache.append(rt.LayerManager.getLayer(i))
-
-                def get_children(parent_name):
-                    children = []
-                    for lyr in all_layers_cache:
-                        p = lyr.getParent()
-                        if p and p.name == parent_name:
-                            children.append(lyr)
-                    return children
-
-                def collect_layers_recursive(parent_lyr):
-                    desc = [parent_lyr]
-                    subdir = get_children(parent_lyr.name)
-                    for child in subdir:
-                        desc.extend(collect_layers_recursive(child))
-                    return desc
-
-                layers_to_clean = collect_layers_recursive(root_layer)
-                valid_names = set(l.name for l in layers_to_clean)
-
-                objs_to_delete = []
-                for obj in rt.objects:
-                    if obj.layer.name in valid_names:
-                        objs_to_delete.append(obj)
-
-                if objs_to_delete:
-                    rt.delete(objs_to_delete)
-
-                for lyr in reversed(layers_to_clean):
-                    try:
-                         rt.LayerManager.deleteLayerByName(lyr.name)
-                    except:
-                         pass
+                all_layers_cache = self.list_layers()
+
+                # Parent name -> children, one getParent() per layer
+                children_by_parent = {}
+                for lyr in all_layers_cache:
+                    p = lyr.getParent()
+                    if p:
+                        children_by_parent.setdefault(p.name, []).append(lyr)
+
+                # Iterative walk: parents always come before their children
+                layers_to_clean = []
+                stack = [root_layer]
+                while stack:
+                    lyr = stack.pop()
+                    layers_to_clean.append(lyr)
+                    stack.extend(children_by_parent.get(lyr.name, []))
+
+                # Objects and layers are deleted in one MaxScript call: nodes are
+                # gathered per layer (no scan of every scene object) and layers
+                # removed children first. Names travel as an array argument.
+                delete_layer_tree = rt.execute("""
+                    fn QSS_DeleteLayerTree names = (
+                        local objs_to_delete = #()
+                        for n in names do (
+                            local lyr = LayerManager.getLayerFromName n
+                            if lyr != undefined do (
+                                local layer_nodes
+                                lyr.nodes &layer_nodes
+                                join objs_to_delete layer_nodes
+                            )
+                        )
+                        if objs_to_delete.count > 0 do delete objs_to_delete
+                        for i = names.count to 1 by -1 do (
+                            try ( LayerManager.deleteLayerByName names[i] ) catch()
+                        )
+                    )
+                """)
+                delete_layer_tree([l.name for l in layers_to_clean])
 
             self.import_single_scene(full_path, index, is_reload=True)
+            # The external rewrite may have dropped the file from the watcher
+            self.watch_file(full_path)
             
             # Clear external modification flag (White Circle)
-            item.setData(QtCore.Qt.UserRole + 4, False)
+            self.set_external_mark(index, False)
 
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Reload Error", str(e))
 
         finally:
+            rt.enableSceneRedraw()
             rt.enableRefMsgs()
-            rt.redrawViews()
+            self.redraw_views()
 
 
         
         # Only restart timer if we are reloading the active scene or finished a batch
         if item == self.active_scene_item:
-            self.dirty_timer.start(500)
-
-    def check_dirty_status(self):
-        """Revisa si la escena de Max necesita guardado y actualiza la UI."""
-        if not self.active_scene_item:
-            return
-
-        if hasattr(self, 'disable_detection_cb') and self.disable_detection_cb.isChecked():
-            if self.is_ui_dirty:
-                self.set_item_dirty(self.active_scene_item, False)
-                self.is_ui_dirty = False
-            return
-
-        is_dirty = False
-        try:
-            is_dirty = rt.getSaveRequired()
-        except:
-            return
-
-        if is_dirty != self.is_ui_dirty:
-            self.set_item_dirty(self.active_scene_item, is_dirty)
-            self.is_ui_dirty = is_dirty
+            self.dirty_timer.start()
 
     def set_item_dirty(self, item, dirty):
         """Añade o quita el asterisco del nombre."""
         text = item.text()
         if dirty:
+            self.dirty_items.add(item)
             if not text.endswith("*"):
                 item.setText(text + "*")
         else:
+            self.dirty_items.discard(item)
             if text.endswith("*"):
                 item.setText(text.rstrip("*"))
 
     def apply_styles(self):
-        qss = """
-        QWidget {
-            background-color: #444444; /* Fondo base oscuro */
-            color: #ffffff;
-            font-family: 'Segoe UI', Arial, sans-serif;
-            font-size: 13px;
-        }
-        QDialog, QDockWidget {
-            background-color: #444444;
-            border: 1px solid #333;
-        }
-        QLabel {
-            color: #ffffff;
-        }
-        QLineEdit {
-            border: 1px solid #444;
-            background-color: #646464;
-            border-radius: 3px;
-            padding: 4px 8px;
-            color: #ffffff;
-        }
-        QPushButton {
-            background-color: #646464;
-            border: 1px solid #555;
-            border-radius: 3px;
-            padding: 5px;
-            color: #ffffff;
-        }
-        QPushButton:hover {
-            background-color: #707070;
-            border-color: #888;
-        }
-        QPushButton:pressed {
-            background-color: #496a93;
-        }
-        QListWidget {
-            border: 1px solid #383838;
-            background-color: #4f4f4f;
-            border-radius: 3px;
-            outline: none;
-            color: #ffffff;
-        }
-        QListWidget::item {
-            padding: 8px 10px;
-            color: #ffffff;
-            border-bottom: 1px solid #3d3d3d;
-        }
-        QListWidget::item:alternate {
-            background-color: #5a5a5a;
-        }
-        QListWidget::item:selected {
-            background-color: #1e9bfd; /* Azul estándar selección */
-            color: #ffffff;
-            border: none;
-        }
-        QListWidget::item:hover:!selected {
-            background-color: #606060;
-        }
-        QCheckBox {
-            color: #ffffff;
-            spacing: 5px;
-        }
-        QCheckBox::indicator {
-            width: 14px;
-            height: 14px;
-            background-color: #646464; /* Unchecked background */
-            border: 1px solid #444;    /* Border requested */
-            border-radius: 8px;
-        }
-        QCheckBox::indicator:hover {
-            border-color: #888;
-            background-color: #707070;
-        }
-        QCheckBox::indicator:checked {
-            width: 6px;
-            height: 6px;
-            background-color: #474747; /* Blue when checked */
-            border: 5px solid #d4d4d4;
-        }
-        """
-        self.setStyleSheet(qss)
-
-        action_btn_style = """
-        QPushButton {
-            background-color: #646464;
-            border: 1px solid #555;
-            color: #ffffff;
-        }
-        QPushButton:hover {
-             background-color: #383838;
-             border: 1px solid #383838;
-        }
-        QPushButton:pressed {
-            background-color: #496a93;
-            border: 1px solid #496a93;
-        }
-        """
-        self.copy_btn.setStyleSheet(action_btn_style)
-        self.paste_btn.setStyleSheet(action_btn_style)
-        self.save_btn.setStyleSheet(action_btn_style)
+        self.setStyleSheet(MAIN_QSS)
+
+        self.copy_btn.setStyleSheet(ACTION_BTN_QSS)
+        self.paste_btn.setStyleSheet(ACTION_BTN_QSS)
+        self.save_btn.setStyleSheet(ACTION_BTN_QSS)
 
     def browse_folder(self):
         """Abre el explorador, selecciona archivos .max y comienza el Merge Process."""
@@ -781,178 +1048,262 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         """
         self.dirty_timer.stop()
 
-        self.folder_name_label.setText(os.path.basename(folder_path))
-
         max_files = []
+        mtimes = {} # full_path -> mtime, taken from the directory listing
         try:
             if file_list:
                 max_files = file_list
+                # The dialog picks files from a single folder: one scandir of it
+                # gives their mtimes, matched by file name (the dialog's path
+                # separators needn't match os.path.join's)
+                path_by_name = {os.path.basename(p): p for p in file_list}
+                try:
+                    with os.scandir(folder_path) as entries:
+                        for entry in entries:
+                            path = path_by_name.get(entry.name)
+                            if path is not None:
+                                mtimes[path] = entry.stat().st_mtime_ns
+                except OSError:
+                    pass # Missing mtimes are stat'ed per file on import
             else:
-                for f in os.listdir(folder_path):
-                    if f.lower().endswith(".max"):
-                        max_files.append(os.path.join(folder_path, f))
+                # scandir returns the stat data with the listing (on Windows no
+                # extra syscall per file), so imports don't re-stat each scene
+                with os.scandir(folder_path) as entries:
+                    for entry in entries:
+                        # is_file() is answered from the listing too (no extra stat)
+                        if entry.name[-4:].lower() == ".max" and entry.is_file():
+                            max_files.append(entry.path)
+                            try:
+                                mtimes[entry.path] = entry.stat().st_mtime_ns
+                            except OSError:
+                                pass
                 max_files.sort()
 
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Could not scan files:\n{e}")
-            self.dirty_timer.start(500)
+            self.dirty_timer.start()
             return
 
         if not max_files:
             QtWidgets.QMessageBox.information(self, "Info", "No .max files found in folder.")
-            self.dirty_timer.start(500)
+            self.dirty_timer.start()
             return
 
+        self.folder_name_label.setText(os.path.basename(folder_path))
+        # The merges below block the UI thread: paint the new folder name now
+        # and show a busy cursor until the list is ready
+        self.folder_name_label.repaint()
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            self._perform_merge(max_files, mtimes)
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+
+        QtCore.QTimer.singleShot(200, lambda: self.force_clean_and_restart_timer(use_temp_save=False))
+
+    def _perform_merge(self, max_files, mtimes):
+        """Actual merge logic of merge_all_scenes: resets Max and imports every file."""
         rt.resetMaxFile(quiet=True)
         rt.setSaveRequired(False)
+        rt.execute('global QSS_MatOriginalNames = #()')
             
         # Reset Master Checkboxes
         self.master_orange_checkbox.setChecked(False)
         self.master_cyan_checkbox.setChecked(False)
-        # Force UI update for button state (will be "Save" since list is cleared below)
-        self.check_cyan_markers_state() 
 
         self.scene_list.clear()
+        self.scene_items = []
+        self.orange_marks = []
+        self.cyan_marks = []
+        self.n_orange = 0
+        self.n_cyan = 0
+        self.external_marks = []
+        self.orange_mxs_entries = []
+        self.layer_name_entries = []
+        self.row_by_path = {}
+        self.dirty_items.clear()
+        self.file_timestamps.clear()
+
+        # Force UI update for button state (will be "Save" since list is cleared)
+        self.check_cyan_markers_state() 
 
-        self.scene_list.clear()
-        self.file_timestamps = {}
+        watched = self.fs_watcher.files()
+        if watched:
+            self.fs_watcher.removePaths(watched)
+
+        # Populate with the model's signals blocked: no per-row insert/dataChanged
+        # traffic, the view re-reads the model once at the end. Painting is off
+        # too so the list never repaints half-populated between merges
+        model = self.scene_list.model()
+        self.scene_list.setUpdatesEnabled(False)
+        model.blockSignals(True)
+        # Same for the viewports: Max coalesces the invalidations of every merge,
+        # layer reparent and material rename into the redraw done afterwards
+        # (reference messages are held back as in reload_scene)
+        rt.disableRefMsgs()
+        rt.disableSceneRedraw()
+        try:
+            for index, full_path in enumerate(max_files):
+                 self.import_single_scene(full_path, index, is_reload=False, mtime=mtimes.get(full_path))
+        finally:
+            rt.enableSceneRedraw()
+            rt.enableRefMsgs()
+            model.blockSignals(False)
+            self.scene_list.reset()
+            self.scene_list.setUpdatesEnabled(True)
+            self.schedule_marker_updates()
 
-        for index, full_path in enumerate(max_files):
-             self.import_single_scene(full_path, index, is_reload=False)
+        if self.file_timestamps:
+            self.fs_watcher.addPaths(list(self.file_timestamps))
 
         rt.clearSelection()
         rt.redrawViews()
         self.clean_up_material_names()
         
         # Activate the first scene by default so the active layer is correct
-        if self.scene_list.count() > 0:
-            first_item = self.scene_list.item(0)
+        if self.scene_items:
+            first_item = self.scene_items[0]
             self.scene_list.setCurrentItem(first_item)
             # Use _perform_scene_switch to skip dirty checks (we just loaded)
             self._perform_scene_switch(first_item)
 
-        QtCore.QTimer.singleShot(200, lambda: self.force_clean_and_restart_timer(use_temp_save=False))
+    def list_layers(self):
+        """All layers of the LayerManager in index order (LayerManager resolved once)."""
+        lm = rt.LayerManager
+        return [lm.getLayer(i) for i in range(lm.count)]
+
+    def snapshot_layers(self):
+        """
+        Reads all layers from the LayerManager in a single pass.
+        Returns ({name: layer}, [layers]) so callers can look layers up locally
+        instead of calling getLayerFromName (a MaxScript round-trip) each time.
+        """
+        layers = self.list_layers()
+        return {l.name: l for l in layers}, layers
 
     def generate_unique_suffix(self):
-        return f".Duplicate.{uuid.uuid4().hex[:8]}"
+        self.suffix_counter += 1
+        return f".Duplicate.{self.suffix_base}{self.suffix_counter:x}"
 
     def clean_up_material_names(self):
         """
-        Removes the .Duplicate.HASH suffix from all materials in the scene.
+        Removes the .Duplicate.HASH suffix from the materials renamed by
+        import_single_scene, restoring the names recorded in QSS_MatOriginalNames.
         """
-
-
-        duplicates_cleaned = 0
-        # Iterate over all scene materials
-        # rt.sceneMaterials includes all materials used in the scene
-        for mat in rt.sceneMaterials:
-            mat_name = mat.name
-            if ".Duplicate." in mat_name:
-                # Find the index of the suffix
-                split_name = mat_name.split(".Duplicate.")
-                original_name = split_name[0]
-
-                # Rename back to original
-                # Since Max allows duplicate names, this is safe and desired
-                try:
-                    mat.name = original_name
-                    duplicates_cleaned += 1
-                except:
-                    pass
+        # Only the recorded materials are visited (looked up by anim handle),
+        # no scan and string parsing of every scene material.
+        # Since Max allows duplicate names, renaming back is safe and desired
+        duplicates_cleaned = rt.execute("""(
+            global QSS_MatOriginalNames
+            local cleaned = 0
+            if QSS_MatOriginalNames != undefined do for e in QSS_MatOriginalNames do (
+                local m = getAnimByHandle e[1]
+                if m != undefined do (
+                    try ( m.name = e[2]; cleaned += 1 ) catch()
+                )
+            )
+            QSS_MatOriginalNames = #()
+            cleaned
+        )""")
 
         print(f"Cleaned up {duplicates_cleaned} duplicate material names.")
 
-    def import_single_scene(self, full_path, index=0, is_reload=False):
+    def import_single_scene(self, full_path, index=0, is_reload=False, mtime=None):
         """
         Imports a SINGLE scene file into the hierarchy.
         Used by merge_all_scenes and also for Reloading.
+        mtime: st_mtime_ns already read by the caller (skips the stat).
         """
         full_path = str(full_path).replace("\\", "/")
         file_name = os.path.basename(full_path)
         display_name = os.path.splitext(file_name)[0]
 
-        try:
-            self.file_timestamps[full_path] = os.path.getmtime(full_path)
-        except:
-            pass
+        if mtime is not None:
+            self.file_timestamps[full_path] = mtime
+        else:
+            try:
+                self.file_timestamps[full_path] = os.stat(full_path).st_mtime_ns
+            except:
+                pass
 
-        scene_root_layer = rt.LayerManager.getLayerFromName(display_name)
+        lm = rt.LayerManager # resolved once for the whole import
+        layers_by_name, _ = self.snapshot_layers()
+
+        scene_root_layer = layers_by_name.get(display_name)
         if not scene_root_layer:
-            scene_root_layer = rt.LayerManager.newLayerFromName(display_name)
+            scene_root_layer = lm.newLayerFromName(display_name)
 
         scene_root_layer.current = True
 
-        existing_layer_names = set()
-        for i in range(rt.LayerManager.count):
-            existing_layer_names.add(rt.LayerManager.getLayer(i).name)
+        existing_layer_names = set(layers_by_name)
+        existing_layer_names.add(display_name)
 
-        rt.mergeMaxFile(full_path, rt.name("mergeDups"), rt.name("select"), quiet=True)
+        rt.mergeMaxFile(full_path, mxs_name("mergeDups"), mxs_name("select"), quiet=True)
 
         # --- UNIQUE MATERIAL RENAMING START ---
         # To prevent name collisions during subsequent merges, we give unique names
         # to the materials of the newly merged objects.
         unique_suffix = self.generate_unique_suffix()
 
-        # Helper to recursively get materials from an object
-        def get_materials_from_nodes(nodes):
-            mats = set()
-            for obj in nodes:
-                if obj.material:
-                    mats.add(obj.material)
-            return mats
-
-        merged_objects = list(rt.selection)
-        merged_materials = get_materials_from_nodes(merged_objects)
-
-        for mat in merged_materials:
-            # Append unique suffix
-            # e.g. "Wood" -> "Wood.Duplicate.a1b2c3d4"
-            try:
-                mat.name = f"{mat.name}{unique_suffix}"
-            except:
-                pass
+        # Append unique suffix to each distinct material of the merged nodes
+        # in a single MaxScript call, e.g. "Wood" -> "Wood.Duplicate.a1b2c3d4".
+        # The original name is recorded by anim handle for clean_up_material_names
+        rt.execute(f"""(
+            global QSS_MatOriginalNames
+            if QSS_MatOriginalNames == undefined do QSS_MatOriginalNames = #()
+            local mats = makeUniqueArray (for o in selection where o.material != undefined collect o.material)
+            for m in mats do (
+                local n = m.name
+                try (
+                    m.name = n + "{unique_suffix}"
+                    append QSS_MatOriginalNames #(getHandleByAnim m, n)
+                ) catch()
+            )
+        )""")
         # --- UNIQUE MATERIAL RENAMING END ---
 
         suffix = f" ({display_name})"
 
-        objs_on_layer_0 = [x for x in rt.selection if x.layer.name == "0"]
+        # Post-merge layers, read once; lookups below go to this dict
+        layers_by_name, _ = self.snapshot_layers()
+
+        # Layers brought in by the merge (layer -> original name), picked from
+        # the snapshot names: no second pass or .name reads over all layers
+        created_layer0_name = f"0{suffix}"
+        skip_names = existing_layer_names | {"0", created_layer0_name}
+        new_layers = {layer: name for name, layer in layers_by_name.items() if name not in skip_names}
+
+        # Bucket the merged nodes by layer name in one pass; layer names come
+        # from a single MaxScript call instead of one x.layer.name per node
+        merged_nodes = list(rt.selection)
+        merged_layer_names = list(rt.execute("for o in selection collect o.layer.name"))
+        objs_by_layer = {}
+        for obj, lname in zip(merged_nodes, merged_layer_names):
+            objs_by_layer.setdefault(lname, []).append(obj)
+
+        objs_on_layer_0 = objs_by_layer.pop("0", None)
         if objs_on_layer_0:
             layer0_name = f"0{suffix}"
-            layer0_scene = rt.LayerManager.getLayerFromName(layer0_name)
+            layer0_scene = layers_by_name.get(layer0_name)
             if not layer0_scene:
-                layer0_scene = rt.LayerManager.newLayerFromName(layer0_name)
+                layer0_scene = lm.newLayerFromName(layer0_name)
+                layers_by_name[layer0_name] = layer0_scene
 
             layer0_scene.setParent(scene_root_layer)
             for obj in objs_on_layer_0:
                 layer0_scene.addNode(obj)
 
-        all_layers = []
-        for i in range(rt.LayerManager.count):
-            all_layers.append(rt.LayerManager.getLayer(i))
-
-        new_layers_set = set()
-        created_layer0_name = f"0{suffix}"
-
-        for layer in all_layers:
-            if layer.name == "0" or layer.name == display_name:
-                    continue
-            if layer.name == created_layer0_name:
-                    continue
-
-            if layer.name not in existing_layer_names:
-                    new_layers_set.add(layer)
-
-        for layer in list(new_layers_set):
-            old_name = layer.name
+        for layer, old_name in new_layers.items():
             new_name = f"{old_name}{suffix}"
 
             layer.setName(new_name)
+            layers_by_name[new_name] = layer
 
             parent = layer.getParent()
 
             is_nested = False
             if parent:
-                if parent in new_layers_set:
+                if parent in new_layers:
                     is_nested = True
 
             if not is_nested:
@@ -961,13 +1312,14 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         for layer_name in existing_layer_names:
             if layer_name == "0": continue
 
-            objs_in_layer = [x for x in rt.selection if x.layer.name == layer_name]
+            objs_in_layer = objs_by_layer.pop(layer_name, None)
             if objs_in_layer:
                 unique_name = f"{layer_name}{suffix}"
-                unique_layer = rt.LayerManager.getLayerFromName(unique_name)
+                unique_layer = layers_by_name.get(unique_name)
                 if not unique_layer:
-                        unique_layer = rt.LayerManager.newLayerFromName(unique_name)
+                        unique_layer = lm.newLayerFromName(unique_name)
                         unique_layer.setParent(scene_root_layer)
+                        layers_by_name[unique_name] = unique_layer
 
                 for obj in objs_in_layer:
                     unique_layer.addNode(obj)
@@ -976,22 +1328,19 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
             should_be_visible = (index == 0)
             scene_root_layer.on = should_be_visible
 
-        icon_item = None
-        try:
-            max_root = rt.getDir(rt.name("maxroot"))
-            custom_icon_path = os.path.join(max_root, "UI_ln", "IconsDark", "ATS", "ATSScene.ico")
-            if os.path.exists(custom_icon_path):
-                    icon_item = QtGui.QIcon(custom_icon_path)
-        except:
-            pass
-
-        if not icon_item or icon_item.isNull():
-                icon_item = get_icon("Citras/3dsMax", QtWidgets.QStyle.SP_FileIcon, self.style())
-
         if not is_reload:
-            item = QtWidgets.QListWidgetItem(icon_item, display_name)
+            item = QtWidgets.QListWidgetItem(get_scene_icon(self.style()), display_name)
             item.setData(QtCore.Qt.UserRole, full_path)
             item.setData(QtCore.Qt.UserRole + 1, display_name)
+            self.orange_marks.append(False)
+            self.cyan_marks.append(False)
+            self.external_marks.append(False)
+            # Escape backslashes for MaxScript string
+            safe_path = full_path.replace("\\", "\\\\")
+            self.orange_mxs_entries.append(f'#("{display_name}", "{safe_path}")')
+            self.layer_name_entries.append(f'@"{display_name}"')
+            self.row_by_path[full_path] = len(self.scene_items)
+            self.scene_items.append(item)
             self.scene_list.addItem(item)
 
             # Activate the first scene by default so the active layer is correct
@@ -1000,7 +1349,6 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
                 self.highlight_item(item, True)
                 # Initialize globals for the first item
                 try:
-                    safe_path = full_path.replace("\\", "\\\\")
                     rt.execute(f'QSS_ActiveScenePath = @"{safe_path}"')
                     rt.execute(f'QSS_ActiveLayerName = @"{display_name}"')
                 except:
@@ -1011,50 +1359,23 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
 
     def check_cyan_markers_state(self):
         """Updates Save button text and style based on cyan markers."""
-        has_cyan_markers = False
-        for i in range(self.scene_list.count()):
-            if self.scene_list.item(i).data(QtCore.Qt.UserRole + 3): # Cyan marker
-                has_cyan_markers = True
-                break
-        
+        has_cyan_markers = self.n_cyan > 0
+
+        # setStyleSheet re-parses the QSS: only touch the button on a transition
+        if has_cyan_markers == self.save_btn_marked:
+            return
+        self.save_btn_marked = has_cyan_markers
+
         if has_cyan_markers:
             self.save_btn.setText(" Save marked")
             self.save_btn.setToolTip("Save all cyan-marked scenes sequentially")
             # Cyan border on hover style
-            self.save_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #646464;
-                    border: 1px solid #4fdc45;
-                    color: #ffffff;
-                }
-                QPushButton:hover {
-                     background-color: #4fdc45;
-                     border: 1px solid #4fdc45; /* Cyan Border */
-                }
-                QPushButton:pressed {
-                    background-color: #559191;
-                    border: 1px solid #4fdc45;
-                }
-            """)
+            self.save_btn.setStyleSheet(SAVE_MARKED_BTN_QSS)
         else:
             self.save_btn.setText(" Save")
             self.save_btn.setToolTip("Save the current scene (layer) back to its file")
             # Revert to standard action style
-            self.save_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #646464;
-                    border: 1px solid #555;
-                    color: #ffffff;
-                }
-                QPushButton:hover {
-                     background-color: #383838;
-                     border: 1px solid #383838;
-                }
-                QPushButton:pressed {
-                    background-color: #496a93;
-                    border: 1px solid #496a93;
-                }
-            """)
+            self.save_btn.setStyleSheet(ACTION_BTN_QSS)
 
 
     def update_master_checkboxes_state(self):
@@ -1063,27 +1384,14 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         If all items are checked -> Master Checked.
         If any item is unchecked -> Master Unchecked.
         """
-        count = self.scene_list.count()
-        if count == 0:
+        count = len(self.scene_items)
+        if not count:
             self.master_cyan_checkbox.setChecked(False)
             self.master_orange_checkbox.setChecked(False)
             return
 
-        all_orange = True
-        all_cyan = True
-
-        for i in range(count):
-            item = self.scene_list.item(i)
-            # Check Orange (UserRole + 2)
-            if not item.data(QtCore.Qt.UserRole + 2):
-                all_orange = False
-            
-            # Check Cyan (UserRole + 3)
-            if not item.data(QtCore.Qt.UserRole + 3):
-                all_cyan = False
-
-            if not all_orange and not all_cyan:
-                break
+        all_orange = self.n_orange == count
+        all_cyan = self.n_cyan == count
 
         # Update Master Safe (we connect to clicked, so setChecked doesn't trigger loop)
         self.master_cyan_checkbox.setChecked(all_cyan)
@@ -1102,13 +1410,11 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         items_to_save = []
         conflicting_items = []
         
-        for i in range(self.scene_list.count()):
-            item = self.scene_list.item(i)
-            # Check Cyan Marker (UserRole + 3)
-            if item.data(QtCore.Qt.UserRole + 3):
+        for item, marked, external in zip(self.scene_items, self.cyan_marks, self.external_marks):
+            if marked:
                 items_to_save.append(item)
-                # Check CONFLICT: Cyan + White (UserRole + 4)
-                if item.data(QtCore.Qt.UserRole + 4):
+                # Check CONFLICT: Cyan + White
+                if external:
                     conflicting_items.append(item)
         
         if not items_to_save:
@@ -1124,14 +1430,8 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         btn_abort = confirm_msg.addButton("Cancel", QtWidgets.QMessageBox.RejectRole)
         
         # Consistent Style
-        btn_continue.setStyleSheet("""
-            background-color: #1e9bfd;
-            color: white;
-            border: 1px solid #1e9bfd;
-            border-radius: 3px;
-            padding: 5px 15px;
-        """)
-        btn_abort.setStyleSheet("padding: 5px 15px;")
+        btn_continue.setStyleSheet(DIALOG_PRIMARY_BTN_QSS)
+        btn_abort.setStyleSheet(DIALOG_BTN_QSS)
         
         confirm_msg.exec_()
         
@@ -1152,15 +1452,9 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
             
             # Button Styles
             # Blue for Reload (Safest/Recommended action in this context?)
-            btn_reload.setStyleSheet("""
-                background-color: #1e9bfd;
-                color: white;
-                border: 1px solid #1e9bfd;
-                border-radius: 3px;
-                padding: 5px 15px;
-            """)
-            btn_overwrite.setStyleSheet("padding: 5px 15px;")
-            btn_cancel.setStyleSheet("padding: 5px 15px;")
+            btn_reload.setStyleSheet(DIALOG_PRIMARY_BTN_QSS)
+            btn_overwrite.setStyleSheet(DIALOG_BTN_QSS)
+            btn_cancel.setStyleSheet(DIALOG_BTN_QSS)
             
             msg_box.exec_()
             
@@ -1173,13 +1467,14 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
                 # Reload conflicting items ONLY, then STOP.
                 self.dirty_timer.stop()
                 try:
-                    for item in conflicting_items:
-                        # We must first switch to scene to ensure clean context if needed, 
-                        # relying on reload_scene logic
-                        self._perform_scene_switch(item) # Switch to the scene to reload it
-                        self.reload_scene(item) # Perform the reload
+                    with self.suppress_redraw():
+                        for item in conflicting_items:
+                            # We must first switch to scene to ensure clean context if needed, 
+                            # relying on reload_scene logic
+                            self._perform_scene_switch(item) # Switch to the scene to reload it
+                            self.reload_scene(item) # Perform the reload
                 finally:
-                    self.dirty_timer.start(500)
+                    self.dirty_timer.start()
                 return 
                 
             elif clicked == btn_overwrite:
@@ -1189,21 +1484,39 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         # 3. Perform Save
         self._perform_batch_save(items_to_save)
 
+    @contextmanager
+    def suppress_redraw(self):
+        """Defers redraw_views calls inside the block to a single redraw at its end."""
+        self.redraw_suppressed += 1
+        try:
+            yield
+        finally:
+            self.redraw_suppressed -= 1
+            if not self.redraw_suppressed:
+                rt.redrawViews()
+
+    def redraw_views(self):
+        """rt.redrawViews(), unless a batch is running (see suppress_redraw)."""
+        if not self.redraw_suppressed:
+            rt.redrawViews()
+
     def _perform_batch_save(self, items_to_save):
         """Actual batch save loop."""
         # Disable updates/timers during batch
         self.dirty_timer.stop()
         
         try:
-            for item in items_to_save:
-                # Switch to scene WITHOUT prompting
-                self._perform_scene_switch(item)
-                # Save
-                self.action_save_selected()
+            # One viewport redraw at the end instead of two per scene
+            with self.suppress_redraw():
+                for item in items_to_save:
+                    # Switch to scene WITHOUT prompting
+                    self._perform_scene_switch(item)
+                    # Save
+                    self.action_save_selected()
                 
             QtWidgets.QMessageBox.information(self, "Batch Complete", f"Saved {len(items_to_save)} scenes.")
         finally:
-            self.dirty_timer.start(500)
+            self.dirty_timer.start()
 
     def switch_to_scene_layer(self, item):
         """
@@ -1217,34 +1530,44 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         self.dirty_timer.stop()
 
         if not self.check_unsaved_changes():
-            self.dirty_timer.start(500)
+            self.dirty_timer.start()
             return
             
         self._perform_scene_switch(item)
 
+        # Changes made while the scene was inactive won't fire the watcher again
+        if self.external_marks[self.scene_list.row(item)]:
+            self.check_external_changes()
+
     def _perform_scene_switch(self, item):
         """Actual switching logic, separated for Automation."""
         tgt_layer_name = item.data(QtCore.Qt.UserRole + 1)
         self.active_scene_item = item
 
-        rt.clearSelection()
-        count = self.scene_list.count()
-        for i in range(count):
-            list_item = self.scene_list.item(i)
-            layer_name = list_item.data(QtCore.Qt.UserRole + 1)
-
-            layer = rt.LayerManager.getLayerFromName(layer_name)
-            if layer:
-                if layer_name == tgt_layer_name:
-                    layer.on = True
-                    layer.current = True
-                else:
-                    layer.on = False
+        # One MaxScript call for all scene layers; .on is only written when it
+        # actually changes, so unchanged layers cause no viewport invalidation.
+        # Returns whether anything visible changed (selection or visibility)
+        layer_names = ", ".join(self.layer_name_entries)
+        view_changed = rt.execute(f"""(
+            local changed = selection.count > 0
+            clearSelection()
+            for n in #({layer_names}) do (
+                local layer = LayerManager.getLayerFromName n
+                if layer != undefined do (
+                    local want_on = (n == @"{tgt_layer_name}")
+                    if layer.on != want_on do ( layer.on = want_on; changed = true )
+                    if want_on do layer.current = true
+                )
+            )
+            changed
+        )""")
 
-        rt.redrawViews()
+        if view_changed:
+            self.redraw_views()
 
-        for i in range(self.scene_list.count()):
-                self.set_item_dirty(self.scene_list.item(i), False)
+        # Only rows that actually carry the asterisk need touching
+        for list_item in list(self.dirty_items):
+                self.set_item_dirty(list_item, False)
 
         self.update_list_highlights()
 
@@ -1271,37 +1594,67 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
         """
         try:
             should_save_temp = use_temp_save
-            if hasattr(self, 'disable_detection_cb') and self.disable_detection_cb.isChecked():
+            if self.detection_disabled:
                 should_save_temp = False
 
             if should_save_temp:
-                temp_dir = rt.getdir(rt.name("temp"))
-                temp_file = os.path.join(temp_dir, "SceneSwitcher_Master_Reset.max")
-                rt.saveMaxFile(temp_file, quiet=True)
+                # Max's temp dir doesn't change during a session: resolve it once
+                if self.reset_temp_file is None:
+                    temp_dir = rt.getdir(mxs_name("temp"))
+                    self.reset_temp_file = os.path.join(temp_dir, "SceneSwitcher_Master_Reset.max")
+                rt.saveMaxFile(self.reset_temp_file, quiet=True)
 
             rt.setSaveRequired(False)
 
             if self.active_scene_item:
                 self.set_item_dirty(self.active_scene_item, False)
             self.is_ui_dirty = False
+            # The flag was just cleared by us: no need to read it back next tick
+            self.max_dirty_hint = False
+            self.dirty_idle_ticks = 0
 
-        except Exception as e:
-            pass
+        except RuntimeError as e:
+            print(f"Error resetting dirty state: {e}")
 
-        if not self.dirty_timer.isActive():
-            self.dirty_timer.start(500)
+        self.dirty_timer.start()
+
+    def on_detection_toggled(self, state):
+        """Keeps detection_disabled in sync with the checkbox and refreshes the flag."""
+        self.detection_disabled = self.disable_detection_cb.isChecked()
+        self.check_dirty_status()
+
+    def _on_max_node_event(self, event, handles):
+        """NodeEventCallback: a node changed, the save flag may have flipped."""
+        self.max_dirty_hint = True
 
     def check_dirty_status(self):
         """Revisa si la escena de Max necesita guardado y actualiza la UI."""
+        if self.deferred_change_paths:
+            # Re-dispatched: the active scene may have changed since, in which
+            # case the path just gets its white marker
+            paths = list(self.deferred_change_paths)
+            self.deferred_change_paths.clear()
+            for path in paths:
+                self._on_file_changed(path)
+            return
+
         if not self.active_scene_item:
             return
 
-        if hasattr(self, 'disable_detection_cb') and self.disable_detection_cb.isChecked():
+        if self.detection_disabled:
             if self.is_ui_dirty:
                 self.set_item_dirty(self.active_scene_item, False)
                 self.is_ui_dirty = False
             return
 
+        # Nothing happened in the scene since the last read: skip the MaxScript call
+        if not self.max_dirty_hint and not self.is_ui_dirty:
+            self.dirty_idle_ticks += 1
+            if self.dirty_idle_ticks < DIRTY_RESAMPLE_TICKS:
+                return
+        self.dirty_idle_ticks = 0
+        self.max_dirty_hint = False
+
         is_dirty = False
         try:
             is_dirty = rt.getSaveRequired()
@@ -1319,7 +1672,7 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
             True si se puede proceder (Save o Don't Save).
             False si se cancela.
         """
-        if hasattr(self, 'disable_detection_cb') and self.disable_detection_cb.isChecked():
+        if self.detection_disabled:
              return True
 
         if rt.getSaveRequired():
@@ -1336,17 +1689,10 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
             btn_dont_save = msg_box.addButton("Don't Save", QtWidgets.QMessageBox.DestructiveRole)
             btn_cancel = msg_box.addButton("Cancel", QtWidgets.QMessageBox.RejectRole)
 
-            btn_save.setStyleSheet("""
-                background-color: #1e9bfd;
-                color: white;
-                border: 1px solid #1e9bfd;
-                border-radius: 3px;
-                padding: 5px 25px; /* Larger padding */
-                font-weight: bold;
-            """)
+            btn_save.setStyleSheet(DIALOG_SAVE_BTN_QSS)
 
-            btn_dont_save.setStyleSheet("padding: 5px 15px;")
-            btn_cancel.setStyleSheet("padding: 5px 15px;")
+            btn_dont_save.setStyleSheet(DIALOG_BTN_QSS)
+            btn_cancel.setStyleSheet(DIALOG_BTN_QSS)
 
             msg_box.exec_()
 
@@ -1365,17 +1711,15 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
 
     def update_list_highlights(self):
         """Pone en negrita el activo, normal el resto."""
-        font_normal = QtGui.QFont()
-        font_normal.setBold(False)
-        font_bold = QtGui.QFont()
-        font_bold.setBold(True)
-
-        for i in range(self.scene_list.count()):
-            item = self.scene_list.item(i)
-            if item == self.active_scene_item:
-                item.setFont(font_bold)
-            else:
-                item.setFont(font_normal)
+        self.scene_list.setUpdatesEnabled(False)
+        try:
+            for item in self.scene_items:
+                want_bold = item == self.active_scene_item
+                # Only rows whose weight actually changes get a new font
+                if item.font().bold() != want_bold:
+                    item.setFont(self.font_bold if want_bold else self.font_normal)
+        finally:
+            self.scene_list.setUpdatesEnabled(True)
 
     def highlight_item(self, item, bold):
         """Ayuda simple para negrita."""
@@ -1406,141 +1750,170 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
 
         save_success = False
 
-        user_selection = list(rt.selection)
-        selection_was_empty = (len(user_selection) == 0)
-
         root_layer = rt.LayerManager.getLayerFromName(layer_name)
         if not root_layer:
             QtWidgets.QMessageBox.warning(self, "Error", f"Root Layer '{layer_name}' not found!")
-            self.dirty_timer.start(500)
+            self.dirty_timer.start()
             return False
 
-        all_layers_cache = []
-        for i in range(rt.LayerManager.count):
-            all_layers_cache.append(rt.LayerManager.getLayer(i))
-
-        state_map = {}
-
-        def get_children_from_cache(parent_name):
-            children = []
-            for lyr in all_layers_cache:
-                p = lyr.getParent()
-                if p and p.name == parent_name:
-                        children.append(lyr)
-            return children
-
-        def collect_descendants_recursive(parent_lyr):
-            desc_list = []
-            direct_children = get_children_from_cache(parent_lyr.name)
-            for child in direct_children:
-                desc_list.append(child)
-                desc_list.extend(collect_descendants_recursive(child))
-            return desc_list
-
-        descendants = collect_descendants_recursive(root_layer)
-
-        valid_layer_names = set()
-        valid_layer_names.add(root_layer.name)
-        for l in descendants:
-            valid_layer_names.add(l.name)
-
-        nodes_to_save = []
-
-        for obj in rt.objects:
-            if obj.layer.name in valid_layer_names:
-                nodes_to_save.append(obj)
+        all_layers_cache = self.list_layers()
+
+        # Parent name -> children, one getParent() per layer
+        children_by_parent = {}
+        for lyr in all_layers_cache:
+            p = lyr.getParent()
+            if p:
+                children_by_parent.setdefault(p.name, []).append(lyr)
+
+        # Breadth-first walk over the root's subtree (root itself excluded):
+        # no recursion depth limit and a stable, level-by-level order
+        descendants = []
+        queue = deque(children_by_parent.get(root_layer.name, []))
+        while queue:
+            lyr = queue.popleft()
+            descendants.append(lyr)
+            queue.extend(children_by_parent.get(lyr.name, []))
+
+        hierarchy_layers = [root_layer] + descendants
+        hierarchy_names = [l.name for l in hierarchy_layers]
+
+        # Nodes are read per layer of the hierarchy (layer.nodes) in one
+        # MaxScript call, instead of testing obj.layer.name for every object
+        # in the scene. The layers are passed as they are (no lookup by name,
+        # which could resolve a duplicate name to another layer). Returns one
+        # node array per layer, in the same order.
+        collect_layer_nodes = rt.execute("""
+            fn QSS_CollectLayerNodes layers = (
+                for lyr in layers collect (
+                    local layer_nodes = #()
+                    lyr.nodes &layer_nodes
+                    layer_nodes
+                )
+            )
+        """)
+        nodes_per_layer = collect_layer_nodes(hierarchy_layers)
 
         layer0_sub_name = f"0{suffix}"
-        moved_nodes_restore_map = {}
+        nodes_to_save = []
+        moved_nodes = [] # nodes sent to layer 0 for the save
+        moved_nodes_restore = [] # (original layer, its moved nodes), one per layer
 
         global_layer_0 = rt.LayerManager.getLayer(0)
 
-        for obj in nodes_to_save:
-            current_layer_name = obj.layer.name
-
-            if current_layer_name == layer0_sub_name:
-                moved_nodes_restore_map[obj] = obj.layer
+        for lyr, lyr_name, layer_nodes in zip(hierarchy_layers, hierarchy_names, nodes_per_layer):
+            layer_nodes = list(layer_nodes)
+            nodes_to_save.extend(layer_nodes)
 
-            elif current_layer_name == layer_name:
-                    moved_nodes_restore_map[obj] = obj.layer
+            if (lyr_name == layer0_sub_name or lyr_name == layer_name) and layer_nodes:
+                moved_nodes.extend(layer_nodes)
+                moved_nodes_restore.append((lyr, layer_nodes))
 
-        if moved_nodes_restore_map:
-            for obj in moved_nodes_restore_map.keys():
-                global_layer_0.addNode(obj)
-
-        for layer in descendants:
-            original_name = layer.name
-            original_parent = layer.getParent()
+        # Nothing to save under this root: skip the rename/reparent/restore passes
+        if not nodes_to_save:
+            QtCore.QTimer.singleShot(200, lambda: self.force_clean_and_restart_timer(use_temp_save=True))
+            return False
 
-            state_map[layer] = {'name': original_name, 'parent': original_parent}
+        # addNode has no array form, so the per-node loop runs in MaxScript:
+        # one call for the move and one per original layer for the restore
+        add_nodes_to_layer = rt.execute("""
+            fn QSS_AddNodesToLayer lyr nodes = (
+                for n in nodes where n.layer != lyr do lyr.addNode n
+                ok
+            )
+        """)
 
-            if original_name.endswith(suffix):
-                clean_name = original_name[:-len(suffix)]
+        # Renames and unparenting run in one MaxScript call. It returns
+        # #(layer, name, parent) per layer for the restore
+        strip_scene_layers = rt.execute("""
+            fn QSS_StripSceneLayers layers new_names root_name = (
+                for i = 1 to layers.count collect (
+                    local lyr = layers[i]
+                    local p = lyr.getParent()
+                    local entry = #(lyr, lyr.name, p)
+                    if new_names[i] != "" and new_names[i] != lyr.name do lyr.setName new_names[i]
+                    if p != undefined and p.name == root_name do lyr.setParent undefined
+                    entry
+                )
+            )
+        """)
 
-                if clean_name == "0":
-                    continue
+        restore_scene_layers = rt.execute("""
+            fn QSS_RestoreSceneLayers layer_state = (
+                for s in layer_state do (
+                    if s[3] != undefined and s[1].getParent() != s[3] do s[1].setParent s[3]
+                    if s[1].name != s[2] do s[1].setName s[2]
+                )
+            )
+        """)
 
-                try:
-                    layer.setName(clean_name)
-                except:
-                    pass
+        suffix_len = len(suffix)
 
-            if original_parent and original_parent.name == root_layer.name:
+        # Clean names are worked out here from the names read for the node
+        # collection (root is entry 0; "" = keep the name). '0 (Scene)' keeps
+        # its name and parent (its nodes go to layer 0), so it isn't sent.
+        strip_layers = []
+        strip_names = []
+        for layer, original_name in zip(descendants, hierarchy_names[1:]):
+            if original_name == layer0_sub_name:
+                continue
+            strip_layers.append(layer)
+            strip_names.append(original_name[:-suffix_len] if original_name.endswith(suffix) else "")
+
+        # Transient edits below: no undo records, no ref-message fan-out and no
+        # viewport invalidation per setName/setParent/addNode. Nothing here can
+        # be undone by the user, so the restore runs in the finally: a failed
+        # strip or save must not leave the hierarchy stripped or nodes on "0"
+        layer_state = None
+        rt.disableRefMsgs()
+        rt.disableSceneRedraw()
+        try:
+            with pymxs.undo(False):
                 try:
-                    layer.setParent(rt.undefined)
-                except:
-                    pass
-
-        rt.clearSelection()
-
-        if nodes_to_save:
-            try:
-                rt.select(nodes_to_save)
-            except Exception as e:
-                pass
+                    if moved_nodes:
+                        add_nodes_to_layer(global_layer_0, moved_nodes)
 
-        final_selection = rt.selection
-        count_sel = final_selection.count
+                    layer_state = strip_scene_layers(strip_layers, strip_names, layer_name)
 
-        if count_sel > 0:
-            result = rt.saveNodes(final_selection, target_file, quiet=True)
-            save_success = True
-
-        for layer, state in state_map.items():
-            try:
-                if state['parent']:
-                    layer.setParent(state['parent'])
-
-                if layer.name != state['name']:
-                    layer.setName(state['name'])
-            except Exception as e:
-                pass
+                    # saveNodes takes the node array directly: the user's selection is
+                    # never touched, so there is nothing to snapshot or restore.
+                    # nodes_to_save is non-empty here (early return above).
+                    # Only an explicit false is taken as failure here; a missing
+                    # file is caught by the post-save stat
+                    save_success = rt.saveNodes(nodes_to_save, target_file, quiet=True) is not False
+                finally:
+                    if layer_state is not None:
+                        restore_scene_layers(layer_state)
 
-        for obj, original_layer in moved_nodes_restore_map.items():
-            try:
-                original_layer.addNode(obj)
-            except Exception as e:
-                pass
+                    # Nodes already on their layer are skipped, so a partial move is fine
+                    for original_layer, layer_nodes in moved_nodes_restore:
+                        add_nodes_to_layer(original_layer, layer_nodes)
 
-        rt.clearSelection()
-        if not selection_was_empty:
-            try:
-                rt.select(user_selection)
-            except: pass
+        except Exception as e:
+            # The scene is already restored (inner finally); the file wasn't saved,
+            # so the dirty state is left as is and detection resumes
+            QtWidgets.QMessageBox.critical(self, "Save Error", str(e))
+            self.dirty_timer.start()
+            return False
 
-        rt.enableRefMsgs()
-        rt.redrawViews()
+        finally:
+            rt.enableSceneRedraw()
+            rt.enableRefMsgs()
+            self.redraw_views()
 
-        if save_success:
-            try:
-                self.file_timestamps[target_file] = os.path.getmtime(target_file)
-            except:
-                pass
-            QtCore.QTimer.singleShot(200, lambda: self.force_clean_and_restart_timer(use_temp_save=True))
-            return True
+        if not save_success:
+            # Nothing was written: keep the dirty state
+            QtWidgets.QMessageBox.warning(self, "Save Error", f"Could not save '{os.path.basename(target_file)}'.")
+            self.dirty_timer.start()
+            return False
 
-        QtCore.QTimer.singleShot(200, lambda: self.force_clean_and_restart_timer(use_temp_save=True))
-        return False
+        # saveNodes had to run here, but the stat doesn't: a slow (network) stat
+        # no longer holds the UI thread. The file is stamped and the dirty
+        # state cleared in _on_saved_file_stat
+        self.pending_stats.add(target_file)
+        stat_task = FileStatTask(target_file)
+        stat_task.signals.finished.connect(self._on_saved_file_stat)
+        QtCore.QThreadPool.globalInstance().start(stat_task)
+        return True
 
     def action_copy(self):
         """Stores the current selection in a global MaxScript variable (In-Memory)."""
@@ -1566,41 +1939,34 @@ class SceneSwitcherUI(QtWidgets.QDockWidget):
             if not clipboard_nodes or len(clipboard_nodes) == 0:
                 return
 
-            # 2. Get Active Layer
-            target_layer = None
+            # 2. Active Layer (resolved in MaxScript, falls back to the current layer)
+            layer_name = ""
             if self.active_scene_item:
                 layer_name = self.active_scene_item.data(QtCore.Qt.UserRole + 1)
-                target_layer = rt.LayerManager.getLayerFromName(layer_name)
-            
-            if not target_layer:
-                target_layer = rt.LayerManager.current
-            
-            # 3. Clone Nodes safely via MaxScript to capture the result 'newNodes'
+
+            # 3. Clone, restore names and move to the target layer in one MaxScript call
+            # (instead of a name get/set + addNode round-trip per pasted node).
             # We use a global var QSS_LastPastedNodes to capture the output
-            rt.execute("""
-                QSS_LastPastedNodes = #()
+            pasted_count = rt.execute(f"""(
+                global QSS_LastPastedNodes = #()
+                local target_layer = LayerManager.getLayerFromName @"{layer_name}"
+                if target_layer == undefined do target_layer = LayerManager.current
+
                 maxOps.cloneNodes QSS_ClipboardNodes cloneType:#copy newNodes:&QSS_LastPastedNodes
-            """)
-            
-            pasted_nodes = rt.QSS_LastPastedNodes
-
-            if pasted_nodes and len(pasted_nodes) > 0:
-                for i, new_obj in enumerate(pasted_nodes):
-                    # Restore original name
-                    original_obj = clipboard_nodes[i]
-                    try:
-                        new_obj.name = original_obj.name
-                    except: pass
-                    
-                    # Move to target layer
-                    target_layer.addNode(new_obj)
-                    
-                rt.select(pasted_nodes)
+                for i = 1 to QSS_LastPastedNodes.count do (
+                    local new_obj = QSS_LastPastedNodes[i]
+                    try ( new_obj.name = QSS_ClipboardNodes[i].name ) catch()
+                    target_layer.addNode new_obj
+                )
+                if QSS_LastPastedNodes.count > 0 do select QSS_LastPastedNodes
+                QSS_LastPastedNodes.count
+            )""")
+
+            if pasted_count:
                 rt.redrawViews()
                 
-        except Exception as e:
-            # print(f"Paste Error: {e}")
-            pass
+        except RuntimeError as e:
+            print(f"Paste Error: {e}")
 
 def run_max_ui():
     app = QtWidgets.QApplication.instance()